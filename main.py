@@ -4,40 +4,177 @@ Simple script to fetch and format student submissions by project
 Calls the Flask API endpoint and formats the output in a readable way
 """
 
+import hashlib
+import json
+import os
 import sys
 import requests
 import argparse
-from collections import defaultdict
+import queue
+import threading
+from concurrent.futures import Future
+from functools import lru_cache
+from itertools import groupby
+from operator import itemgetter
 from typing import Dict, List, Any
 from datetime import datetime
+from urllib.parse import parse_qs, urlsplit
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+try:
+    import orjson
+except ImportError:  # Optional: faster JSON decoding, falls back to response.json()
+    orjson = None
 
-def fetch_submissions(base_url: str, student: str = None, master_repo_owner: str = "codepath", 
-                      start_date: str = None, end_date: str = None, ignore_invalids: bool = False,
-                      providers: List[str] = None, include_master_submissions: bool = False,
-                      report_owner_submissions: bool = False, include_closed: bool = False,
-                      github_token: str = None, gitlab_token: str = None,
-                      repository: str = None) -> Dict[str, Any]:
+try:
+    import requests_cache
+except ImportError:  # Optional: responses are simply not cached without it
+    requests_cache = None
+
+try:
+    from ciso8601 import parse_datetime as parse_iso_datetime
+except ImportError:  # Optional: faster ISO 8601 parsing
+    if sys.version_info >= (3, 11):
+        # fromisoformat() accepts a trailing 'Z' since Python 3.11
+        parse_iso_datetime = datetime.fromisoformat
+    else:
+        def parse_iso_datetime(date_str: str) -> datetime:
+            return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+
+
+# Sort key for report rows built by summarize_submissions: (project, student, date)
+report_row_key = itemgetter(0, 1, 2)
+
+# Report section rules
+SEPARATOR = "=" * 80
+DIVIDER = "-" * 80
+
+# Submission URL templates (owner, repo, number[, comment id]) and display labels
+COMMENT_URL = "https://github.com/{}/{}/issues/{}#issuecomment-{}".format
+PULL_REQUEST_URL = "https://github.com/{}/{}/pull/{}".format
+REPO_TYPE_LOCATIONS = {'student_fork': "own fork", 'codepath_repo': "codepath repo"}
+STATUS_LABELS = {True: "✅ VALID", False: "❌ INVALID"}
+
+# Print debug details (set by --verbose or SUBMISSIONS_VERBOSE=1)
+VERBOSE = os.environ.get('SUBMISSIONS_VERBOSE') == '1'
+
+# Number of users fetched concurrently when batch processing master_submissions.txt
+DEFAULT_WORKERS = 4
+
+# Connection pool size of the shared HTTP session (should be >= number of workers)
+HTTP_POOL_SIZE = 16
+
+# Response cache (opt-in with --cache-ttl, needs requests-cache), shared by every checkout/working directory
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'codepath')
+CACHE_NAME = os.path.join(CACHE_DIR, 'submissions_cache')
+DEFAULT_CACHE_TTL = 0
+
+# Query parameters that carry API tokens (never written to the cache file)
+TOKEN_PARAMETERS = ['github_token', 'gitlab_token']
+
+_session = None
+
+
+def cache_key(request, **kwargs) -> str:
     """
-    Fetch submissions from the API endpoint
+    requests-cache key function that keeps responses fetched with different tokens apart
+    
+    The token parameters are stripped before the default key is built, so a
+    hash of their values is appended instead of the values themselves.
+    """
+    query = parse_qs(urlsplit(request.url).query)
+    tokens = '&'.join(f"{name}={query.get(name, [''])[0]}" for name in TOKEN_PARAMETERS)
+    token_hash = hashlib.sha256(tokens.encode()).hexdigest()[:16]
+    return f"{requests_cache.create_key(request, **kwargs)}-{token_hash}"
+
+
+def create_session(pool_size: int = HTTP_POOL_SIZE, cache_ttl: int = 0) -> requests.Session:
+    """
+    Create an HTTP session that keeps connections alive between API calls
+    
+    Rate-limit and unavailable responses (429, 503) and failed connection
+    attempts are retried with backoff, honoring the server's Retry-After
+    header. Read timeouts are not retried. If requests-cache is installed
+    and cache_ttl > 0, successful GET responses are cached in a SQLite file
+    under CACHE_DIR, keyed per token (see cache_key). Expired entries that
+    carry an ETag/Last-Modified validator are revalidated with a conditional
+    request, so unchanged data comes back as a bodiless 304.
     
     Args:
-        base_url: Base URL of the API (e.g., http://localhost:3000)
-        student: Optional student username (if None, fetches all students)
-        master_repo_owner: Master repo owner (default: codepath)
-        start_date: Optional start date filter (YYYY-MM-DD or ISO format)
-        end_date: Optional end date filter (YYYY-MM-DD or ISO format)
-        ignore_invalids: Ignore/exclude invalid submissions (default: False, includes invalid)
-        providers: List of provider types to filter by (e.g., ['github', 'gitlab'])
-        include_master_submissions: Fetch submissions from owner/master repositories via API (default: False)
-        report_owner_submissions: Include list of users who made submissions to owner/master repos (default: False)
-        include_closed: Include closed issues and pull requests (default: False)
-        github_token: GitHub API token (overrides env var)
-        gitlab_token: GitLab API token (overrides env var)
-        repository: Filter by specific repository (full path like 'codepath/ios101-prework')
+        pool_size: Maximum number of pooled connections per host
+        cache_ttl: Seconds to keep cached responses (0 disables caching)
     
     Returns:
-        API response as dictionary
+        Configured requests session
+    """
+    retries = Retry(
+        total=5,
+        connect=2,
+        read=False,  # Never re-send a request whose (up to 20 minute) read timed out
+        backoff_factor=0.3,
+        status_forcelist=[429, 503],
+        respect_retry_after_header=True,
+        raise_on_status=False  # Let raise_for_status() report the final error
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries)
+    
+    if requests_cache and cache_ttl > 0:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        session = requests_cache.CachedSession(
+            CACHE_NAME,
+            backend='sqlite',
+            expire_after=cache_ttl,
+            cache_control=True,
+            allowable_methods=['GET'],
+            ignored_parameters=TOKEN_PARAMETERS,  # Keep tokens out of the cache file
+            key_fn=cache_key
+        )
+    else:
+        session = requests.Session()
+    session.headers.update({'Accept': 'application/json'})
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def configure_session(pool_size: int = HTTP_POOL_SIZE, cache_ttl: int = 0):
+    """Replace the shared HTTP session (called once from main() with CLI options)"""
+    global _session
+    if cache_ttl > 0 and requests_cache is None:
+        print("⚠️  Warning: --cache-ttl needs requests-cache (pip install requests-cache), responses will not be cached")
+    _session = create_session(pool_size=pool_size, cache_ttl=cache_ttl)
+
+
+def get_session() -> requests.Session:
+    """Return the shared HTTP session, creating it on first use"""
+    global _session
+    if _session is None:
+        _session = create_session()
+    return _session
+
+
+def close_session():
+    """Close the shared HTTP session and release its pooled connections"""
+    global _session
+    if _session is not None:
+        _session.close()
+        _session = None
+
+
+def build_submissions_request(base_url: str, student: str = None, master_repo_owner: str = "codepath",
+                              start_date: str = None, end_date: str = None, ignore_invalids: bool = False,
+                              providers: List[str] = None, include_master_submissions: bool = False,
+                              report_owner_submissions: bool = False, include_closed: bool = False,
+                              github_token: str = None, gitlab_token: str = None,
+                              repository: str = None) -> tuple:
+    """
+    Build the URL and query parameters for a submissions request
+    
+    Takes the same filter arguments as fetch_submissions.
+    
+    Returns:
+        Tuple of (url, params)
     """
     if student:
         url = f"{base_url}/admin/fetch-student-submission/{student}"
@@ -83,83 +220,191 @@ def fetch_submissions(base_url: str, student: str = None, master_repo_owner: str
     if student:
         params['student'] = student
     
+    return url, params
+
+
+def print_request_summary(url: str, params: Dict[str, str]):
+    """Print the URL and filters of a request built by build_submissions_request"""
     print(f"🔍 Fetching submissions from: {url}")
-    print(f"   Master repo owner: {master_repo_owner}")
-    if student:
-        print(f"   Student: {student}")
-    if start_date:
-        print(f"   Start date: {start_date}")
-    if end_date:
-        print(f"   End date: {end_date}")
-    if providers:
-        print(f"   Providers: {', '.join(providers)}")
-    if include_master_submissions:
+    print(f"   Master repo owner: {params['master_repo_owner']}")
+    if 'student' in params:
+        print(f"   Student: {params['student']}")
+    if 'start_date' in params:
+        print(f"   Start date: {params['start_date']}")
+    if 'end_date' in params:
+        print(f"   End date: {params['end_date']}")
+    if 'providers' in params:
+        print(f"   Providers: {params['providers'].replace(',', ', ')}")
+    if params['include_master_submissions'] == 'true':
         print(f"   Include master submissions: enabled")
-    if report_owner_submissions:
+    if params['report_owner_submissions'] == 'true':
         print(f"   Report owner submissions: enabled")
-    if include_closed:
+    if params['include_closed'] == 'true':
         print(f"   Include closed: enabled")
-    if ignore_invalids:
+    if params['ignore_invalids'] == 'true':
         print(f"   Ignore invalids: enabled")
-    if github_token:
+    if 'github_token' in params:
         print(f"   GitHub token: provided")
-    if gitlab_token:
+    if 'gitlab_token' in params:
         print(f"   GitLab token: provided")
-    if repository:
-        print(f"   Repository: {repository}")
+    if 'repository' in params:
+        print(f"   Repository: {params['repository']}")
     print()
+
+
+def request_submissions(url: str, params: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Send a submissions request and decode the JSON response
+    
+    When the response cache is enabled, error payloads ({"success": false} or
+    invalid JSON) are removed from it again so they are never replayed.
     
+    Raises:
+        requests.exceptions.RequestException: If the request fails
+        ValueError: If the response body is not valid JSON
+    """
+    session = get_session()
+    response = session.get(url, params=params, timeout=1200)
+    response.raise_for_status()
     try:
-        response = requests.get(url, params=params, timeout=1200)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
+        if orjson:
+            # Decode the raw bytes directly, skipping the str round-trip of response.json()
+            data = orjson.loads(response.content)
+        else:
+            data = response.json()
+    except ValueError:
+        forget_cached_response(session, response)
+        raise
+    if isinstance(data, dict) and not data.get('success', True):
+        forget_cached_response(session, response)
+    return data
+
+
+def forget_cached_response(session: requests.Session, response: requests.Response):
+    """Remove a response from the requests-cache store (no-op for an uncached session)"""
+    cache = getattr(session, 'cache', None)
+    if cache is not None:
+        cache.delete(requests=[response.request])
+
+
+def fetch_submissions(base_url: str, student: str = None, master_repo_owner: str = "codepath", 
+                      start_date: str = None, end_date: str = None, ignore_invalids: bool = False,
+                      providers: List[str] = None, include_master_submissions: bool = False,
+                      report_owner_submissions: bool = False, include_closed: bool = False,
+                      github_token: str = None, gitlab_token: str = None,
+                      repository: str = None) -> Dict[str, Any]:
+    """
+    Fetch submissions from the API endpoint
+    
+    Args:
+        base_url: Base URL of the API (e.g., http://localhost:3000)
+        student: Optional student username (if None, fetches all students)
+        master_repo_owner: Master repo owner (default: codepath)
+        start_date: Optional start date filter (YYYY-MM-DD or ISO format)
+        end_date: Optional end date filter (YYYY-MM-DD or ISO format)
+        ignore_invalids: Ignore/exclude invalid submissions (default: False, includes invalid)
+        providers: List of provider types to filter by (e.g., ['github', 'gitlab'])
+        include_master_submissions: Fetch submissions from owner/master repositories via API (default: False)
+        report_owner_submissions: Include list of users who made submissions to owner/master repos (default: False)
+        include_closed: Include closed issues and pull requests (default: False)
+        github_token: GitHub API token (overrides env var)
+        gitlab_token: GitLab API token (overrides env var)
+        repository: Filter by specific repository (full path like 'codepath/ios101-prework')
+    
+    Returns:
+        API response as dictionary
+    """
+    url, params = build_submissions_request(
+        base_url=base_url,
+        student=student,
+        master_repo_owner=master_repo_owner,
+        start_date=start_date,
+        end_date=end_date,
+        ignore_invalids=ignore_invalids,
+        providers=providers,
+        include_master_submissions=include_master_submissions,
+        report_owner_submissions=report_owner_submissions,
+        include_closed=include_closed,
+        github_token=github_token,
+        gitlab_token=gitlab_token,
+        repository=repository
+    )
+    print_request_summary(url, params)
+    
+    try:
+        return request_submissions(url, params)
+    except (requests.exceptions.RequestException, ValueError) as e:  # ValueError: invalid JSON body
         print(f"❌ Error fetching submissions: {e}")
         sys.exit(1)
 
 
+def fetch_in_background(requests_to_send: List[tuple], workers: int = DEFAULT_WORKERS) -> List[Future]:
+    """
+    Start sending (url, params) requests on daemon worker threads
+    
+    Failures are stored on the returned futures instead of exiting. Daemon
+    threads never hold up interpreter exit, so an aborted batch does not wait
+    for requests that are still in flight; cancel the futures to skip the rest.
+    
+    Args:
+        requests_to_send: List of (url, params) tuples
+        workers: Maximum number of concurrent requests
+    
+    Returns:
+        One future per request, in the same order
+    """
+    jobs = queue.SimpleQueue()
+    futures = []
+    for url, params in requests_to_send:
+        future = Future()
+        futures.append(future)
+        jobs.put((future, url, params))
+    
+    def worker():
+        while True:
+            try:
+                future, url, params = jobs.get_nowait()
+            except queue.Empty:
+                return
+            if not future.set_running_or_notify_cancel():
+                continue  # Cancelled before it started
+            try:
+                future.set_result(request_submissions(url, params))
+            except BaseException as e:
+                future.set_exception(e)
+    
+    for _ in range(min(max(1, workers), len(futures))):
+        threading.Thread(target=worker, daemon=True).start()
+    
+    return futures
+
+
 def get_submission_location(submission: Dict[str, Any]) -> str:
     """Determine where the submission was made"""
     if submission.get('is_codepath_submission'):
         return "codepath repo"
     
-    repo_type = submission.get('repo_type', 'unknown')
-    if repo_type == 'student_fork':
-        return "own fork"
-    elif repo_type == 'codepath_repo':
-        return "codepath repo"
-    else:
-        return "other"
+    return REPO_TYPE_LOCATIONS.get(submission.get('repo_type', 'unknown'), "other")
 
 
-def get_submission_url(submission: Dict[str, Any]) -> str:
-    """Generate GitHub URL for the submission"""
-    owner = submission.get('owner_name')
-    repo = submission.get('repo_name')
+@lru_cache(maxsize=8192)
+def parse_submission_date(date_str: str) -> datetime:
+    """
+    Parse a submission date in ISO format (2023-12-01T10:30:00Z) or simple date format (2023-12-01)
+    Results are cached, so the summary pass and the report rendering share one parse per date
     
-    if submission['submission_type'] == 'COMMENT':
-        issue_num = submission.get('issue_number')
-        comment_id = submission.get('comment_id')
-        return f"https://github.com/{owner}/{repo}/issues/{issue_num}#issuecomment-{comment_id}"
-    elif submission['submission_type'] == 'PULL_REQUEST':
-        pr_num = submission.get('pr_number')
-        return f"https://github.com/{owner}/{repo}/pull/{pr_num}"
+    Args:
+        date_str: Date string
     
-    return "N/A"
-
-
-def get_submission_title(submission: Dict[str, Any]) -> str:
-    """Get the title/description of the submission"""
-    if submission['submission_type'] == 'COMMENT':
-        issue_display = submission.get('issue_display', f"#{submission.get('issue_number')}")
-        issue_title = submission.get('issue_title', 'Unknown')
-        return f"{issue_display} - {issue_title}"
-    elif submission['submission_type'] == 'PULL_REQUEST':
-        pr_num = submission.get('pr_number')
-        pr_title = submission.get('pr_title', 'Unknown')
-        return f"PR #{pr_num} - {pr_title}"
+    Returns:
+        Parsed datetime
     
-    return "Unknown"
+    Raises:
+        ValueError: If the date string is not in either format
+    """
+    if 'T' in date_str:
+        return parse_iso_datetime(date_str)
+    return datetime.strptime(date_str, '%Y-%m-%d')
 
 
 def format_submission_date(date_str: str) -> str:
@@ -180,7 +425,7 @@ def format_submission_date(date_str: str) -> str:
         # Try parsing as ISO format first
         if 'T' in date_str:
             # ISO format: 2025-11-27T23:33:11+00:00
-            date_obj = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+            date_obj = parse_submission_date(date_str)
         else:
             # Try RFC 2822 format: Mon, 24 Nov 2025 12:24:46 GMT
             from email.utils import parsedate_to_datetime
@@ -194,21 +439,66 @@ def format_submission_date(date_str: str) -> str:
         return date_str
 
 
+def format_row(submission: Dict[str, Any]) -> tuple:
+    """
+    Build every display field of a submission in one go
+    
+    The title and GitHub URL both depend on the submission type, so they are
+    built together in a single branch.
+    
+    Args:
+        submission: Submission dictionary
+    
+    Returns:
+        Tuple of (title, location, url, status, date) strings
+    """
+    submission_type = submission['submission_type']
+    owner = submission.get('owner_name')
+    repo = submission.get('repo_name')
+    
+    if submission_type == 'COMMENT':
+        issue_num = submission.get('issue_number')
+        issue_display = submission.get('issue_display', f"#{issue_num}")
+        title = f"{issue_display} - {submission.get('issue_title', 'Unknown')}"
+        url = COMMENT_URL(owner, repo, issue_num, submission.get('comment_id'))
+    elif submission_type == 'PULL_REQUEST':
+        pr_num = submission.get('pr_number')
+        title = f"PR #{pr_num} - {submission.get('pr_title', 'Unknown')}"
+        url = PULL_REQUEST_URL(owner, repo, pr_num)
+    else:
+        title = "Unknown"
+        url = "N/A"
+    
+    location = get_submission_location(submission)
+    status = STATUS_LABELS[bool(submission.get('is_valid'))]
+    date = format_submission_date(submission.get('submission_date', 'N/A'))
+    
+    return title, location, url, status, date
+
+
 def filter_submissions_by_date(submissions: List[Dict[str, Any]], start_date: str = None, end_date: str = None) -> List[Dict[str, Any]]:
     """
     Filter submissions by date range
     
     Args:
         submissions: List of submission dictionaries
-        start_date: Optional start date filter (YYYY-MM-DD format)
-        end_date: Optional end date filter (YYYY-MM-DD format)
+        start_date: Optional start date filter (YYYY-MM-DD or ISO format)
+        end_date: Optional end date filter (YYYY-MM-DD or ISO format)
     
     Returns:
-        Filtered list of submissions
+        Filtered list of submissions (empty if a filter date is invalid)
     """
     if not start_date and not end_date:
         return submissions
     
+    # Parse the filter bounds once rather than for every submission
+    try:
+        start_dt = parse_submission_date(start_date).date() if start_date else None
+        end_dt = parse_submission_date(end_date).date() if end_date else None
+    except (ValueError, TypeError) as e:
+        print(f"⚠️  Warning: Invalid date filter (expected YYYY-MM-DD or ISO format): {e}")
+        return []
+    
     filtered_submissions = []
     
     for submission in submissions:
@@ -217,25 +507,13 @@ def filter_submissions_by_date(submissions: List[Dict[str, Any]], start_date: st
             continue
             
         try:
-            # Parse submission date (handle both ISO format and other formats)
-            if 'T' in submission_date_str:
-                # ISO format: 2023-12-01T10:30:00Z
-                submission_date = datetime.fromisoformat(submission_date_str.replace('Z', '+00:00'))
-            else:
-                # Simple date format: 2023-12-01
-                submission_date = datetime.strptime(submission_date_str, '%Y-%m-%d')
-            
-            # Check start date filter
-            if start_date:
-                start_dt = datetime.strptime(start_date, '%Y-%m-%d')
-                if submission_date.date() < start_dt.date():
-                    continue
+            submission_day = parse_submission_date(submission_date_str).date()
             
-            # Check end date filter
-            if end_date:
-                end_dt = datetime.strptime(end_date, '%Y-%m-%d')
-                if submission_date.date() > end_dt.date():
-                    continue
+            # Check date range filters
+            if start_dt and submission_day < start_dt:
+                continue
+            if end_dt and submission_day > end_dt:
+                continue
             
             filtered_submissions.append(submission)
             
@@ -247,6 +525,45 @@ def filter_submissions_by_date(submissions: List[Dict[str, Any]], start_date: st
     return filtered_submissions
 
 
+def update_student_date_range(student_dates: Dict[str, list], student: str, submission_date_str: str):
+    """
+    Fold one submission date into a student's [earliest, latest, count] record (updates student_dates in place)
+    
+    Args:
+        student_dates: Dictionary mapping student names to [earliest, latest, count] records
+        student: Student name
+        submission_date_str: Submission date string (submissions without one are ignored)
+    """
+    if not submission_date_str:
+        return
+        
+    try:
+        submission_date = parse_submission_date(submission_date_str)
+        
+        # A plain list is cheaper to create and update than a dict per student,
+        # and it is only built for a student's first submission
+        record = student_dates.get(student)
+        if record is None:
+            student_dates[student] = record = [submission_date, submission_date, 0]
+        record[2] += 1
+        
+        if submission_date < record[0]:
+            record[0] = submission_date
+        if submission_date > record[1]:
+            record[1] = submission_date
+            
+    except (ValueError, TypeError):
+        pass
+
+
+def date_range_info(student_dates: Dict[str, list]) -> Dict[str, Dict[str, Any]]:
+    """Convert [earliest, latest, count] records into date range info dictionaries"""
+    return {
+        student: {'earliest': earliest, 'latest': latest, 'count': count}
+        for student, (earliest, latest, count) in student_dates.items()
+    }
+
+
 def get_student_date_ranges(submissions: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
     """
     Calculate date ranges for each student
@@ -260,37 +577,58 @@ def get_student_date_ranges(submissions: List[Dict[str, Any]]) -> Dict[str, Dict
     student_dates = {}
     
     for submission in submissions:
+        update_student_date_range(student_dates, submission.get('student', 'unknown'), submission.get('submission_date'))
+    
+    return date_range_info(student_dates)
+
+
+def get_project_name(submission: Dict[str, Any]) -> str:
+    """Get the project (base repo name) a submission belongs to"""
+    # Use source_repository for forks, otherwise use repository
+    repo_full = submission.get('source_repository') or submission.get('repository', 'unknown')
+    
+    # Extract just the repo name (after the /)
+    if '/' in repo_full:
+        return repo_full.split('/')[-1]
+    return submission.get('repo_name', 'unknown')
+
+
+def summarize_submissions(submissions: List[Dict[str, Any]]) -> tuple:
+    """
+    Order submissions for the report and collect summary data in a single pass
+    
+    Args:
+        submissions: List of submission dictionaries
+    
+    Returns:
+        Tuple of (rows, student_date_ranges, total_students, total_projects) where rows is a
+        list of (project_name, student_name, submission_date, submission) tuples sorted by
+        project, then student, then date
+    """
+    rows = []
+    student_dates = {}
+    students_seen = set()
+    projects_seen = set()
+    
+    # Bind the per-item methods once instead of looking them up on every iteration
+    add_row = rows.append
+    add_student = students_seen.add
+    add_project = projects_seen.add
+    
+    for submission in submissions:
+        submission_date = submission.get('submission_date') or ''
         student = submission.get('student', 'unknown')
-        submission_date_str = submission.get('submission_date')
-        
-        if not submission_date_str:
-            continue
-            
-        try:
-            # Parse submission date
-            if 'T' in submission_date_str:
-                submission_date = datetime.fromisoformat(submission_date_str.replace('Z', '+00:00'))
-            else:
-                submission_date = datetime.strptime(submission_date_str, '%Y-%m-%d')
-            
-            if student not in student_dates:
-                student_dates[student] = {
-                    'earliest': submission_date,
-                    'latest': submission_date,
-                    'count': 0
-                }
-            
-            student_dates[student]['count'] += 1
-            
-            if submission_date < student_dates[student]['earliest']:
-                student_dates[student]['earliest'] = submission_date
-            if submission_date > student_dates[student]['latest']:
-                student_dates[student]['latest'] = submission_date
-                
-        except (ValueError, TypeError):
-            continue
+        project_name = get_project_name(submission)
+        add_row((project_name, student, submission_date, submission))
+        add_project(project_name)
+        add_student(submission.get('student'))
+        update_student_date_range(student_dates, student, submission_date)
     
-    return student_dates
+    # One sort replaces grouping into nested dicts plus a sort per project/student.
+    # The sort is stable, so same-date submissions keep their API order.
+    rows.sort(key=report_row_key)
+    
+    return rows, date_range_info(student_dates), len(students_seen), len(projects_seen)
 
 
 def save_owner_submission_users(data: Dict[str, Any], filename: str = "master_submissions.txt"):
@@ -376,10 +714,13 @@ def process_master_submissions_batch(base_url: str, master_repo_owner: str, file
                                      start_date: str = None, end_date: str = None, ignore_invalids: bool = False,
                                      include_master_submissions: bool = False, include_closed: bool = False,
                                      github_token: str = None, gitlab_token: str = None,
-                                     repository: str = None):
+                                     repository: str = None, workers: int = DEFAULT_WORKERS):
     """
     Process each user in master_submissions.txt file
     
+    Users are fetched concurrently (the API calls are network-bound) but
+    their reports are printed one at a time, in file order.
+    
     Args:
         base_url: Base URL of the API
         master_repo_owner: Master repo owner
@@ -392,6 +733,7 @@ def process_master_submissions_batch(base_url: str, master_repo_owner: str, file
         github_token: GitHub API token
         gitlab_token: GitLab API token
         repository: Filter by specific repository (full path like 'codepath/ios101-prework')
+        workers: Number of users to fetch concurrently (default: DEFAULT_WORKERS)
     """
     users = read_master_submissions_file(filename)
     
@@ -403,40 +745,56 @@ def process_master_submissions_batch(base_url: str, master_repo_owner: str, file
     print(f"📋 Processing {len(users)} users from {filename}")
     print(f"{'='*80}\n")
     
-    for idx, (username, provider) in enumerate(users, 1):
-        print(f"\n{'='*80}")
-        print(f"[{idx}/{len(users)}] Processing: {username} ({provider})")
-        print(f"{'='*80}\n")
-        
-        try:
-            # Fetch submissions for this specific user and provider
-            data = fetch_submissions(
-                base_url=base_url,
-                student=username,
-                master_repo_owner=master_repo_owner,
-                start_date=start_date,
-                end_date=end_date,
-                ignore_invalids=ignore_invalids,
-                providers=[provider],
-                include_master_submissions=include_master_submissions,
-                report_owner_submissions=False,  # Don't generate new master_submissions.txt for each user
-                include_closed=include_closed,
-                github_token=github_token,
-                gitlab_token=gitlab_token,
-                repository=repository
-            )
-            
-            # Check for API errors
-            if not data.get('success', True):
-                print(f"❌ API returned error for {username}: {data.get('error', 'Unknown error')}")
-                continue
+    request_list = [
+        # Fetch submissions for this specific user and provider
+        build_submissions_request(
+            base_url=base_url,
+            student=username,
+            master_repo_owner=master_repo_owner,
+            start_date=start_date,
+            end_date=end_date,
+            ignore_invalids=ignore_invalids,
+            providers=[provider],
+            include_master_submissions=include_master_submissions,
+            report_owner_submissions=False,  # Don't generate new master_submissions.txt for each user
+            include_closed=include_closed,
+            github_token=github_token,
+            gitlab_token=gitlab_token,
+            repository=repository
+        )
+        for username, provider in users
+    ]
+    
+    get_session()  # Create the shared session before the worker threads need it
+    futures = fetch_in_background(request_list, workers=workers)
+    
+    try:
+        for idx, ((username, provider), (url, params), future) in enumerate(zip(users, request_list, futures), 1):
+            print(f"\n{'='*80}")
+            print(f"[{idx}/{len(users)}] Processing: {username} ({provider})")
+            print(f"{'='*80}\n")
             
-            # Format and display
-            format_submissions(data)
+            # Printed here rather than by the workers so the output stays in file order
+            print_request_summary(url, params)
             
-        except Exception as e:
-            print(f"❌ Error processing {username}: {e}")
-            continue
+            try:
+                data = future.result()
+                
+                # Check for API errors
+                if not data.get('success', True):
+                    print(f"❌ API returned error for {username}: {data.get('error', 'Unknown error')}")
+                    continue
+                
+                # Format and display
+                format_submissions(data)
+                
+            except Exception as e:
+                print(f"❌ Error processing {username}: {e}")
+                continue
+    finally:
+        # Skip fetches that will never be printed (e.g. after Ctrl-C); in-flight ones are abandoned
+        for future in futures:
+            future.cancel()
     
     print(f"\n{'='*80}")
     print(f"✅ Completed processing {len(users)} users")
@@ -447,7 +805,8 @@ def format_submissions(data: Dict[str, Any]):
     """Format and print submissions grouped by project and student"""
     
     # Debug: Print the keys in the response
-    print(f"🔍 DEBUG: Response keys: {list(data.keys())}")
+    if VERBOSE:
+        print(f"🔍 DEBUG: Response keys: {list(data.keys())}")
     
     # Check if owner submission users data is available and save to file FIRST
     # (before checking for submissions, in case there are no submissions but we have owner users)
@@ -477,7 +836,6 @@ def format_submissions(data: Dict[str, Any]):
         has_owner_users = ('report' in data and 'owner_submission_users' in data['report']) or 'owner_submission_users' in data
         if not has_owner_users:
             print(f"📄 Full response structure:")
-            import json
             print(json.dumps(data, indent=2)[:500])  # Print first 500 chars
         return
     
@@ -487,184 +845,171 @@ def format_submissions(data: Dict[str, Any]):
     
     print()  # Add blank line after debug info
     
-    # Group submissions by project (base repo name) and then by student
-    # project_name -> student_name -> [submissions]
-    by_project = defaultdict(lambda: defaultdict(list))
+    # Build the report as a list of lines and write it once, instead of a print() per line
+    out = []
+    append = out.append
     
-    for submission in submissions:
-        # Use source_repository for forks, otherwise use repository
-        repo_full = submission.get('source_repository') or submission.get('repository', 'unknown')
-        
-        # Extract just the repo name (after the /)
-        if '/' in repo_full:
-            repo_name = repo_full.split('/')[-1]
-        else:
-            repo_name = submission.get('repo_name', 'unknown')
-        
-        student = submission.get('student', 'unknown')
-        by_project[repo_name][student].append(submission)
+    # Order submissions by project (base repo name), student and date,
+    # collecting the summary numbers in the same pass
+    rows, student_date_ranges, total_students, total_projects = summarize_submissions(submissions)
     
-    # Print formatted output
     total_submissions = len(submissions)
-    total_students = len(set(s.get('student') for s in submissions))
-    total_projects = len(by_project)
-    
-    # Calculate per-student date ranges
-    student_date_ranges = get_student_date_ranges(submissions)
-    
-    print("=" * 80)
-    print("📊 STUDENT SUBMISSIONS SUMMARY")
-    print("=" * 80)
-    print(f"Total Projects: {total_projects}")
-    print(f"Total Students: {total_students}")
-    print(f"Total Submissions: {total_submissions}")
-    print()
+    
+    append(SEPARATOR)
+    append("📊 STUDENT SUBMISSIONS SUMMARY")
+    append(SEPARATOR)
+    append(f"Total Projects: {total_projects}")
+    append(f"Total Students: {total_students}")
+    append(f"Total Submissions: {total_submissions}")
+    append("")
     
     # Show per-student date ranges
     if student_date_ranges:
-        print("📅 STUDENT DATE RANGES")
-        print("-" * 80)
-        for student in sorted(student_date_ranges.keys()):
-            date_info = student_date_ranges[student]
-            earliest = date_info['earliest'].strftime('%Y-%m-%d')
-            latest = date_info['latest'].strftime('%Y-%m-%d')
+        append("📅 STUDENT DATE RANGES")
+        append(DIVIDER)
+        for student, date_info in sorted(student_date_ranges.items(), key=itemgetter(0)):
+            # isoformat() starts with YYYY-MM-DD and skips strftime's locale-aware formatting
+            earliest = date_info['earliest'].isoformat()[:10]
+            latest = date_info['latest'].isoformat()[:10]
             count = date_info['count']
+            plural = '' if count == 1 else 's'
             
             if earliest == latest:
-                print(f"👤 {student}: {earliest} ({count} submission{'s' if count != 1 else ''})")
+                append(f"👤 {student}: {earliest} ({count} submission{plural})")
             else:
-                print(f"👤 {student}: {earliest} to {latest} ({count} submission{'s' if count != 1 else ''})")
-        print()
-    
-    # Sort projects alphabetically
-    for project_name in sorted(by_project.keys()):
-        print("=" * 80)
-        print(f"📦 Project: {project_name}")
-        print("=" * 80)
+                append(f"👤 {student}: {earliest} to {latest} ({count} submission{plural})")
+        append("")
+    
+    # Rows are sorted by project, student and date, so consecutive runs form the groups
+    for project_name, project_rows in groupby(rows, key=itemgetter(0)):
+        append(SEPARATOR)
+        append(f"📦 Project: {project_name}")
+        append(SEPARATOR)
         
-        students = by_project[project_name]
-        
-        # Sort students alphabetically
-        for student_name in sorted(students.keys()):
-            print(f"\n👤 Student: {student_name}")
-            print("-" * 80)
-            
-            student_submissions = students[student_name]
-            # Sort submissions by date
-            student_submissions.sort(key=lambda x: x.get('submission_date', ''))
+        for student_name, student_rows in groupby(project_rows, key=itemgetter(1)):
+            append(f"\n👤 Student: {student_name}")
+            append(DIVIDER)
             
-            for idx, submission in enumerate(student_submissions, 1):
-                title = get_submission_title(submission)
-                location = get_submission_location(submission)
-                url = get_submission_url(submission)
-                status = "✅ VALID" if submission.get('is_valid') else "❌ INVALID"
-                date = format_submission_date(submission.get('submission_date', 'N/A'))
+            for idx, (_, _, _, submission) in enumerate(student_rows, 1):
+                title, location, url, status, date = format_row(submission)
                 
-                print(f"{idx}. {title}")
-                print(f"   Repository: {submission.get('repository', 'N/A')}")
-                print(f"   Location: {location}")
-                print(f"   Status: {status}")
-                print(f"   Date: {date}")
-                print(f"   URL: {url}")
+                # Each submission becomes one pre-joined block in the output
+                lines = [
+                    f"{idx}. {title}",
+                    f"   Repository: {submission.get('repository', 'N/A')}",
+                    f"   Location: {location}",
+                    f"   Status: {status}",
+                    f"   Date: {date}",
+                    f"   URL: {url}"
+                ]
                 
                 # Show validity reasons if invalid
                 if not submission.get('is_valid'):
                     reasons = submission.get('validity_reasons', [])
                     if reasons:
-                        print(f"   ⚠️  Reasons: {', '.join(reasons)}")
+                        lines.append(f"   ⚠️  Reasons: {', '.join(reasons)}")
                 
                 # Show addressed issues if available
                 addressed = submission.get('addressed_issues', [])
                 if addressed:
-                    print(f"   🎯 Addresses: {', '.join(addressed)}")
+                    lines.append(f"   🎯 Addresses: {', '.join(addressed)}")
                 
-                print()
+                lines.append("")
+                append("\n".join(lines))
         
-        print()
+        append("")
+    
+    append(SEPARATOR)
     
-    print("=" * 80)
+    sys.stdout.write("\n".join(out) + "\n")
+
+
+# Usage guide shown when --base-url is missing
+USAGE_GUIDE = """\
+================================================================================
+📚 Student Submissions Formatter - Usage Guide
+================================================================================
+
+This script fetches and formats student submissions from the API.
+
+📊 Features:
+  • Date filtering with --start-date and --end-date
+  • Provider filtering (GitHub/GitLab) with --providers
+  • Repository/project filtering with --repository (e.g., codepath/ios101-prework)
+  • Include/exclude invalid submissions
+  • Fetch submissions from master repos (codepath/puter) with --include-master-submissions
+  • Save owner submission users to master_submissions.txt with --report-owner-submissions
+  • Batch process each user with interactive prompt or --batch-process flag
+  • Per-student date range summaries
+  • Individual submission details with dates
+
+⚠️  Required: You must specify --base-url
+
+Common Examples:
+--------------------------------------------------------------------------------
+
+1. Fetch a specific student from production:
+   python main.py \\
+       --base-url https://www.zenocross.com \\
+       --student jellyfishing2346 \\
+       --master-repo-owner codepath
+
+2. Fetch all students with master repo submissions (GitHub PRs to codepath/puter):
+   python main.py \\
+       --base-url https://www.zenocross.com \\
+       --master-repo-owner codepath \\
+       --include-master-submissions
+
+3. Fetch submissions within a date range:
+   python main.py \\
+       --base-url https://www.zenocross.com \\
+       --start-date 2023-12-01 \\
+       --end-date 2023-12-31 \\
+       --master-repo-owner codepath
+
+4. Filter by provider (GitHub only):
+   python main.py \\
+       --base-url https://www.zenocross.com \\
+       --providers github \\
+       --master-repo-owner codepath
+
+5. Exclude invalid submissions:
+   python main.py \\
+       --base-url https://www.zenocross.com \\
+       --exclude-invalid \\
+       --master-repo-owner codepath
+
+6. Filter by specific repository/project:
+   python main.py \\
+       --base-url https://www.zenocross.com \\
+       --repository codepath/ios101-prework \\
+       --master-repo-owner codepath
+
+7. Generate list of users who submitted to master repos and process them:
+   python main.py \\
+       --base-url https://www.zenocross.com \\
+       --master-repo-owner codepath \\
+       --include-master-submissions \\
+       --report-owner-submissions
+   (Creates master_submissions.txt, then prompts to process each user)
+
+8. Batch process without prompting:
+   python main.py \\
+       --base-url https://www.zenocross.com \\
+       --master-repo-owner codepath \\
+       --report-owner-submissions \\
+       --batch-process
+
+================================================================================
+
+For more help, use: python main.py --help
+
+"""
 
 
 def show_usage_guide():
     """Show helpful usage guide when base URL is not provided"""
-    print("=" * 80)
-    print("📚 Student Submissions Formatter - Usage Guide")
-    print("=" * 80)
-    print()
-    print("This script fetches and formats student submissions from the API.")
-    print()
-    print("📊 Features:")
-    print("  • Date filtering with --start-date and --end-date")
-    print("  • Provider filtering (GitHub/GitLab) with --providers")
-    print("  • Repository/project filtering with --repository (e.g., codepath/ios101-prework)")
-    print("  • Include/exclude invalid submissions")
-    print("  • Fetch submissions from master repos (codepath/puter) with --include-master-submissions")
-    print("  • Save owner submission users to master_submissions.txt with --report-owner-submissions")
-    print("  • Batch process each user with interactive prompt or --batch-process flag")
-    print("  • Per-student date range summaries")
-    print("  • Individual submission details with dates")
-    print()
-    print("⚠️  Required: You must specify --base-url")
-    print()
-    print("Common Examples:")
-    print("-" * 80)
-    print()
-    print("1. Fetch a specific student from production:")
-    print("   python main.py \\")
-    print("       --base-url https://www.zenocross.com \\")
-    print("       --student jellyfishing2346 \\")
-    print("       --master-repo-owner codepath")
-    print()
-    print("2. Fetch all students with master repo submissions (GitHub PRs to codepath/puter):")
-    print("   python main.py \\")
-    print("       --base-url https://www.zenocross.com \\")
-    print("       --master-repo-owner codepath \\")
-    print("       --include-master-submissions")
-    print()
-    print("3. Fetch submissions within a date range:")
-    print("   python main.py \\")
-    print("       --base-url https://www.zenocross.com \\")
-    print("       --start-date 2023-12-01 \\")
-    print("       --end-date 2023-12-31 \\")
-    print("       --master-repo-owner codepath")
-    print()
-    print("4. Filter by provider (GitHub only):")
-    print("   python main.py \\")
-    print("       --base-url https://www.zenocross.com \\")
-    print("       --providers github \\")
-    print("       --master-repo-owner codepath")
-    print()
-    print("5. Exclude invalid submissions:")
-    print("   python main.py \\")
-    print("       --base-url https://www.zenocross.com \\")
-    print("       --exclude-invalid \\")
-    print("       --master-repo-owner codepath")
-    print()
-    print("6. Filter by specific repository/project:")
-    print("   python main.py \\")
-    print("       --base-url https://www.zenocross.com \\")
-    print("       --repository codepath/ios101-prework \\")
-    print("       --master-repo-owner codepath")
-    print()
-    print("7. Generate list of users who submitted to master repos and process them:")
-    print("   python main.py \\")
-    print("       --base-url https://www.zenocross.com \\")
-    print("       --master-repo-owner codepath \\")
-    print("       --include-master-submissions \\")
-    print("       --report-owner-submissions")
-    print("   (Creates master_submissions.txt, then prompts to process each user)")
-    print()
-    print("8. Batch process without prompting:")
-    print("   python main.py \\")
-    print("       --base-url https://www.zenocross.com \\")
-    print("       --master-repo-owner codepath \\")
-    print("       --report-owner-submissions \\")
-    print("       --batch-process")
-    print()
-    print("=" * 80)
-    print()
-    print("For more help, use: python main.py --help")
-    print()
+    sys.stdout.write(USAGE_GUIDE)
 
 
 def main():
@@ -753,6 +1098,26 @@ Examples:
         help='Automatically process each user from master_submissions.txt without prompting'
     )
     
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f'Number of users to fetch concurrently during batch processing (default: {DEFAULT_WORKERS})'
+    )
+    
+    parser.add_argument(
+        '--cache-ttl',
+        type=int,
+        default=DEFAULT_CACHE_TTL,
+        help=f'Seconds to cache API responses, requires requests-cache (default: {DEFAULT_CACHE_TTL}, no caching)'
+    )
+    
+    parser.add_argument(
+        '--verbose',
+        action='store_true',
+        help='Print debug details such as the keys of each API response (or set SUBMISSIONS_VERBOSE=1)'
+    )
+    
     parser.add_argument(
         '--include-closed',
         action='store_true',
@@ -777,11 +1142,20 @@ Examples:
     # Parse arguments
     args = parser.parse_args()
     
+    global VERBOSE
+    VERBOSE = VERBOSE or args.verbose
+    
     # Check if base URL is provided
     if not args.base_url:
         show_usage_guide()
         sys.exit(1)
     
+    # Size the connection pool so every batch worker can keep its own connection alive
+    configure_session(
+        pool_size=max(HTTP_POOL_SIZE, args.workers),
+        cache_ttl=args.cache_ttl
+    )
+    
     # Fetch submissions from API
     data = fetch_submissions(
         base_url=args.base_url,
@@ -808,7 +1182,6 @@ Examples:
     format_submissions(data)
     
     # Check if master_submissions.txt was created and prompt for batch processing
-    import os
     if args.report_owner_submissions and os.path.exists('master_submissions.txt'):
         # Check if file has content
         users = read_master_submissions_file('master_submissions.txt')
@@ -838,7 +1211,8 @@ Examples:
                     include_closed=args.include_closed,
                     github_token=args.github_token,
                     gitlab_token=args.gitlab_token,
-                    repository=args.repository
+                    repository=args.repository,
+                    workers=args.workers
                 )
             else:
                 print("\n✅ Skipping batch processing. You can process users later by running with --batch-process flag.")
@@ -847,4 +1221,7 @@ Examples:
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    try:
+        main()
+    finally:
+        close_session()
\ No newline at end of file
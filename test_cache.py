@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the response cache (--cache-ttl) against a local HTTP server
+Requires requests-cache: pip install requests-cache
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+try:
+    import main
+except ImportError:
+    print("❌ Could not import main.py")
+    print("Make sure main.py is in the same directory")
+    sys.exit(1)
+
+if main.requests_cache is None:
+    print("❌ requests-cache is not installed (pip install requests-cache)")
+    sys.exit(1)
+
+
+class FakeAPIHandler(BaseHTTPRequestHandler):
+    """Answers every GET with JSON; students named 'error' get {"success": false}"""
+    paths = []
+
+    def do_GET(self):
+        self.paths.append(self.path)
+        body = json.dumps({'success': '/error?' not in self.path, 'all_submissions': []}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass  # Keep the test output readable
+
+
+def fetch(base_url: str, student: str, token: str) -> int:
+    """Fetch one student and return how many requests reached the server"""
+    before = len(FakeAPIHandler.paths)
+    url, params = main.build_submissions_request(base_url, student=student, github_token=token)
+    main.request_submissions(url, params)
+    return len(FakeAPIHandler.paths) - before
+
+
+def test_cache():
+    """Check which requests the cache answers and what it stores"""
+    server = HTTPServer(('127.0.0.1', 0), FakeAPIHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    # Keep the test cache away from the real one in ~/.cache/codepath
+    main.CACHE_DIR = tempfile.mkdtemp()
+    main.CACHE_NAME = os.path.join(main.CACHE_DIR, 'submissions_cache')
+    main.configure_session(cache_ttl=60)
+
+    checks = [
+        ("First request reaches the server", fetch(base_url, 'student', 'token-A') == 1),
+        ("Same token is served from the cache", fetch(base_url, 'student', 'token-A') == 0),
+        ("Different token reaches the server", fetch(base_url, 'student', 'token-B') == 1),
+        ("Error payload reaches the server", fetch(base_url, 'error', 'token-A') == 1),
+        ("Error payload is not cached", fetch(base_url, 'error', 'token-A') == 1),
+    ]
+
+    main.close_session()
+    server.shutdown()
+
+    with open(main.CACHE_NAME + '.sqlite', 'rb') as f:
+        cache_file = f.read()
+    checks.append(("No token is written to the cache file", b'token-' not in cache_file))
+
+    failed = 0
+    for description, passed in checks:
+        print(f"{'✅' if passed else '❌'} {description}")
+        failed += not passed
+
+    if failed:
+        print(f"\n❌ {failed} cache check(s) failed")
+        sys.exit(1)
+    print("\n✅ All cache checks passed")
+
+
+if __name__ == '__main__':
+    test_cache()